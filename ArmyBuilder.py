@@ -0,0 +1,226 @@
+import argparse
+import math
+from functools import reduce
+
+from ZoidsGame import load_zoids, filter_zoids
+from ZoidsSim import SimZoid
+from ZoidsMatchmaking import Matchmaker, load_win_rate_matrix
+
+
+def _d20_chance(needed):
+    # Chance that a d20 rolls at least `needed`
+    return min(20, max(0, 21 - needed)) / 20
+
+
+def _pressure(attacker, defender):
+    # Expected dents per attack for the attacker's better weapon
+    best = 0.0
+    weapons = [(attacker.melee, attacker.fighting + attacker.close_combat, defender.parry)]
+    for damage in (attacker.close_range, attacker.mid_range, attacker.long_range):
+        weapons.append((damage, attacker.dexterity + attacker.ranged_combat, defender.dodge))
+    for damage, bonus, defense in weapons:
+        if not damage:
+            continue
+        hit = _d20_chance(10 + defense - bonus)
+        dent = 1 - _d20_chance(damage + 15 - defender.toughness)
+        best = max(best, hit * dent)
+    return best
+
+
+def analytic_win_rate(a, b):
+    # Cheap stand-in for simulation: each side's share of the combined
+    # expected dents per exchange.
+    pa, pb = _pressure(a, b), _pressure(b, a)
+    if pa + pb == 0:
+        return 0.5
+    return pa / (pa + pb)
+
+
+def strength_scores(zoids, terrain, factions=None, matrix=None):
+    # Mean expected win rate of each eligible Zoid against the whole terrain
+    # roster, from a win-rate matrix when we have one.
+    roster = filter_zoids(zoids, terrain)
+    candidates = [z for z in roster if factions is None or z.get("Faction") in factions]
+    scores = {}
+    if matrix is not None:
+        matchmaker = Matchmaker(zoids, terrain, matrix)
+        for z in candidates:
+            rates = matchmaker.expected_win_rates(z)
+            scores[z["Name"]] = sum(rates.values()) / len(rates) if rates else 0.5
+        return scores
+    compiled = {z["Name"]: SimZoid(z) for z in roster}
+    for z in candidates:
+        me = compiled[z["Name"]]
+        rates = [analytic_win_rate(me, other) for name, other in compiled.items() if name != z["Name"]]
+        scores[z["Name"]] = sum(rates) / len(rates) if rates else 0.5
+    return scores
+
+
+def _pareto(items):
+    # Drop any Zoid that costs at least as much as another but scores no
+    # better; it can always be swapped out without losing strength.
+    kept = []
+    for name, cost, score in sorted(items, key=lambda i: (i[1], -i[2], i[0])):
+        if not kept or score > kept[-1][2]:
+            kept.append((name, cost, score))
+    return kept
+
+
+def build_army(zoids, budget, terrain, factions=None, matrix=None, max_units=None):
+    scores = strength_scores(zoids, terrain, factions, matrix)
+    costs = {z["Name"]: int(round(z["Cost"])) for z in zoids if z["Name"] in scores}
+    items = _pareto([(name, costs[name], scores[name]) for name in scores if costs[name] > 0])
+    army = {}
+    if not items or budget < items[0][1]:
+        return {"army": army, "cost": 0, "strength": 0.0}
+
+    # Work in units of the largest cost that divides every price
+    step = reduce(math.gcd, (cost for _, cost, _ in items))
+    unit_costs = [cost // step for _, cost, _ in items]
+    capacity = int(budget // step)
+
+    # An optimal army never needs more than (best-ratio cost) other Zoids,
+    # so past that point the rest of the budget is filled greedily.
+    best = max(range(len(items)), key=lambda i: (items[i][2] / unit_costs[i], -unit_costs[i]))
+    reserve = unit_costs[best] * max(unit_costs)
+    extra = max(0, (capacity - reserve) // unit_costs[best])
+    picks = _solve_unbounded(unit_costs, [s for _, _, s in items], capacity - extra * unit_costs[best])
+    if max_units is not None and extra + len(picks) > max_units:
+        # The unit limit binds, so solve with it instead
+        capacity = min(capacity, max_units * max(unit_costs))
+        extra = 0
+        picks = _solve_limited(unit_costs, [s for _, _, s in items], capacity, max_units)
+    if extra:
+        army[items[best][0]] = extra
+
+    for i in picks:
+        army[items[i][0]] = army.get(items[i][0], 0) + 1
+    return {
+        "army": army,
+        "cost": sum(costs[name] * count for name, count in army.items()),
+        "strength": sum(scores[name] * count for name, count in army.items()),
+    }
+
+
+def _solve_unbounded(costs, scores, capacity):
+    best = [0.0] * (capacity + 1)
+    choice = [-1] * (capacity + 1)
+    for c in range(1, capacity + 1):
+        best[c] = best[c - 1]
+        for i, cost in enumerate(costs):
+            if cost <= c and best[c - cost] + scores[i] > best[c]:
+                best[c] = best[c - cost] + scores[i]
+                choice[c] = i
+    picks = []
+    c = capacity
+    while c > 0:
+        if choice[c] == -1:
+            c -= 1
+        else:
+            picks.append(choice[c])
+            c -= costs[choice[c]]
+    return picks
+
+
+def _upper_hull(points):
+    # Upper concave hull of (cost, score) points plus (0, 0), by cost, up to
+    # the strongest point
+    hull = []
+    for point in sorted(points + [(0, 0.0)]):
+        while len(hull) >= 2:
+            (c1, s1), (c2, s2) = hull[-2], hull[-1]
+            if (s2 - s1) * (point[0] - c1) <= (point[1] - s1) * (c2 - c1):
+                hull.pop()
+            else:
+                break
+        hull.append(point)
+    # Past the strongest Zoid, spending more buys nothing
+    top = max(range(len(hull)), key=lambda k: (hull[k][1], -k))
+    return hull[:top + 1]
+
+
+def _lp_bound(hull, slots, capacity):
+    # Best strength if Zoids could be bought in fractions: spread `slots`
+    # units over the hull at an average cost of capacity / slots
+    if slots <= 0 or capacity <= 0:
+        return 0.0
+    average = capacity / slots
+    for (c1, s1), (c2, s2) in zip(hull, hull[1:]):
+        if average <= c2:
+            return slots * (s1 + (average - c1) * (s2 - s1) / (c2 - c1))
+    return slots * hull[-1][1]
+
+
+def _solve_limited(costs, scores, capacity, max_units):
+    # Branch and bound over how many of each Zoid to take, most expensive
+    # first. The bound is the fractional (LP) optimum of the Zoids still to be
+    # decided, which is exact enough that only a few branches survive; the
+    # work no longer grows with max_units * capacity like a layered DP.
+    order = sorted(range(len(costs)), key=lambda i: -costs[i])
+    hulls = [_upper_hull([(costs[i], scores[i]) for i in order[k:]]) for k in range(len(order))]
+    hulls.append([(0, 0.0)])
+    counts = [0] * len(order)
+    best = [0.0, []]
+
+    def search(k, slots, capacity, strength):
+        i = order[k]
+        most = min(slots, capacity // costs[i])
+        if k == len(order) - 1:
+            if strength + most * scores[i] > best[0]:
+                counts[k] = most
+                best[:] = [strength + most * scores[i], list(counts)]
+                counts[k] = 0
+            return
+
+        def bound(count):
+            return count * scores[i] + _lp_bound(hulls[k + 1], slots - count, capacity - count * costs[i])
+
+        # The bound is concave in count: find its peak, then walk away from it
+        # in both directions until it drops to the best army found so far
+        lo, hi = 0, most
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if bound(mid) < bound(mid + 1):
+                lo = mid + 1
+            else:
+                hi = mid
+        for counts_tried in (range(lo, -1, -1), range(lo + 1, most + 1)):
+            for count in counts_tried:
+                if strength + bound(count) <= best[0] + 1e-9:
+                    break
+                counts[k] = count
+                search(k + 1, slots - count, capacity - count * costs[i], strength + count * scores[i])
+        counts[k] = 0
+
+    search(0, max_units, capacity, 0.0)
+    picks = []
+    for k, count in enumerate(best[1]):
+        picks.extend([order[k]] * count)
+    return picks
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the strongest army a budget can buy")
+    parser.add_argument("budget", type=float, help="credits available")
+    parser.add_argument("--stats", default="ConvertedZoidStats.json")
+    parser.add_argument("--terrain", choices=["land", "water", "air"], default="land")
+    parser.add_argument("--faction", action="append", help="allowed faction (repeatable)")
+    parser.add_argument("--matrix", help="win-rate matrix from ZoidsMatchmaking.py build")
+    parser.add_argument("--max-units", type=int)
+    args = parser.parse_args(argv)
+
+    zoids = load_zoids(args.stats)
+    matrix = load_win_rate_matrix(args.matrix) if args.matrix else None
+    result = build_army(zoids, args.budget, args.terrain, args.faction, matrix, args.max_units)
+    if not result["army"]:
+        print("No Zoids affordable with that budget.")
+        return
+    print(f"\nArmy for {args.budget:,.0f} credits ({args.terrain}):")
+    for name, count in sorted(result["army"].items(), key=lambda item: (-item[1], item[0])):
+        print(f"  {count} x {name}")
+    print(f"Total cost: {result['cost']:,} credits")
+    print(f"Strength: {result['strength']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
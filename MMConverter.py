@@ -270,16 +270,17 @@ def convert_zoid_stats(input_file, output_file):
     return log
     
 
-# Example usage
-input_path = 'ZoidStats.json'
-output_path = 'ConvertedZoidStats.json'
-log = convert_zoid_stats(input_path, output_path)
-for power_level in sorted(list(log)):
-    data= log[power_level]
-    if data['count'] == 0:
-        continue
-    print(f"Power Level {power_level}")
-    print(f"  Average Melee: {data['melee'] / data['count'] if data['count'] > 0 else 0}")
-    print(f"  Average Best Ranged: {data['best ranged'] / data['count'] if data['count'] > 0 else 0}")
-    print(f"  Average Toughness: {data['toughness'] / data['count'] if data['count'] > 0 else 0}")
-    print()
+def main(input_path='ZoidStats.json', output_path='ConvertedZoidStats.json'):
+    log = convert_zoid_stats(input_path, output_path)
+    for power_level in sorted(list(log)):
+        data= log[power_level]
+        if data['count'] == 0:
+            continue
+        print(f"Power Level {power_level}")
+        print(f"  Average Melee: {data['melee'] / data['count'] if data['count'] > 0 else 0}")
+        print(f"  Average Best Ranged: {data['best ranged'] / data['count'] if data['count'] > 0 else 0}")
+        print(f"  Average Toughness: {data['toughness'] / data['count'] if data['count'] > 0 else 0}")
+        print()
+
+if __name__ == "__main__":
+    main()
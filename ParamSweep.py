@@ -0,0 +1,167 @@
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from ZoidsGame import load_zoids, filter_zoids
+from ZoidsSim import compile_zoids, estimate_win_rate
+
+TERRAINS = ["land", "water", "air"]
+# One representative starting distance per range band (see ZoidsGame.get_range),
+# plus a far one where the long-range Zoids get several free turns
+DISTANCE_BUCKETS = [0, 250, 750, 1500, 3000]
+
+# Compiled stat blocks, built once per worker process
+_compiled = {}
+
+
+def _init_worker(zoids):
+    _compiled.update(compile_zoids(zoids))
+
+
+def _sweep_pair(task):
+    # Every grid point for one pair in one terrain. Only a-vs-b is simulated;
+    # the b-vs-a entry for the other first mover is the same duel mirrored.
+    a, b, terrain, distances, width, seed = task
+    points = {}
+    for distance in distances:
+        for first in (1, 2):
+            result = estimate_win_rate(_compiled[a], _compiled[b], terrain, distance, width,
+                                       seed=seed, first=first)
+            points[_key(a, b, terrain, distance, first)] = result["win_rate"]
+            points[_key(b, a, terrain, distance, 3 - first)] = 1 - result["win_rate"]
+    return points
+
+
+def _key(a, b, terrain, distance, first):
+    return f"{a}|{b}|{terrain}|{distance:g}|{first}"
+
+
+def cache_settings(zoids, width, seed):
+    # Cached points are only valid for the stats and settings they came from
+    roster = json.dumps(zoids, sort_keys=True).encode("utf-8")
+    return {"width": width, "seed": seed, "roster": hashlib.sha256(roster).hexdigest()}
+
+
+def load_cache(path, settings):
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        cache = json.load(f)
+    if cache.get("settings") != settings:
+        raise ValueError(f"Cache {path} was built with a different roster, width or seed")
+    return cache["points"]
+
+
+def save_cache(path, settings, points):
+    if not path:
+        return
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"settings": settings, "points": points}, f)
+    os.replace(tmp_path, path)
+
+
+def run_sweep(zoids, names=None, terrains=TERRAINS, distances=DISTANCE_BUCKETS, width=0.2, seed=0,
+              workers=None, cache_path=None):
+    # Returns heatmap-ready nested lists:
+    #   win_rate[terrain][distance][first - 1][i][j]  chance names[i] beats names[j]
+    #   profile[terrain][i][distance]                 names[i]'s mean win rate
+    # with None wherever a Zoid can't fight in that terrain.
+    roster = {z["Name"]: z for z in zoids}
+    names = sorted(names or roster)
+    missing = [name for name in names if name not in roster]
+    if missing:
+        raise ValueError(f"Unknown Zoid: {', '.join(missing)}")
+    settings = cache_settings(zoids, width, seed)
+    cache = load_cache(cache_path, settings)
+
+    tasks = []
+    for terrain in terrains:
+        eligible = sorted(z["Name"] for z in filter_zoids([roster[n] for n in names], terrain))
+        for i, a in enumerate(eligible):
+            for b in eligible[i + 1:]:
+                if all(_key(a, b, terrain, d, f) in cache for d in distances for f in (1, 2)):
+                    continue
+                tasks.append((a, b, terrain, distances, width, seed))
+
+    if tasks:
+        used = sorted({n for task in tasks for n in task[:2]})
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=([roster[n] for n in used],)) as pool:
+            for points in pool.map(_sweep_pair, tasks, chunksize=max(1, len(tasks) // 64)):
+                cache.update(points)
+        save_cache(cache_path, settings, cache)
+
+    win_rate = []
+    profile = []
+    for terrain in terrains:
+        eligible = {z["Name"] for z in filter_zoids([roster[n] for n in names], terrain)}
+        grids = []
+        for distance in distances:
+            by_first = []
+            for first in (1, 2):
+                by_first.append([[None if a not in eligible or b not in eligible
+                                  else 0.5 if a == b
+                                  else cache[_key(a, b, terrain, distance, first)]
+                                  for b in names] for a in names])
+            grids.append(by_first)
+        win_rate.append(grids)
+
+        rows = []
+        for i, a in enumerate(names):
+            if a not in eligible or len(eligible) < 2:
+                rows.append(None)
+                continue
+            row = []
+            for d in range(len(distances)):
+                rates = [grids[d][f][i][j] for f in (0, 1) for j, b in enumerate(names) if b in eligible and b != a]
+                row.append(sum(rates) / len(rates))
+            rows.append(row)
+        profile.append(rows)
+
+    return {
+        "zoids": names,
+        "terrains": list(terrains),
+        "distances": list(distances),
+        "first": [1, 2],
+        "win_rate": win_rate,
+        "profile": profile,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep matchups over distance, terrain and turn order")
+    parser.add_argument("zoids", nargs="*", help="Zoids to include (default: whole roster)")
+    parser.add_argument("--stats", default="ConvertedZoidStats.json")
+    parser.add_argument("--terrain", choices=TERRAINS, action="append")
+    parser.add_argument("--distance", type=float, action="append", help="starting distance (repeatable)")
+    parser.add_argument("--width", type=float, default=0.2, help="target confidence interval width")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--cache", help="file to reuse and store simulated grid points")
+    parser.add_argument("--output", help="write the arrays as JSON")
+    args = parser.parse_args(argv)
+
+    zoids = load_zoids(args.stats)
+    try:
+        sweep = run_sweep(zoids, args.zoids or None, args.terrain or TERRAINS, args.distance or DISTANCE_BUCKETS,
+                          args.width, args.seed, args.workers, args.cache)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(sweep, f)
+
+    distances = sweep["distances"]
+    for t, terrain in enumerate(sweep["terrains"]):
+        print(f"\n{terrain.capitalize()}: mean win rate by starting distance")
+        print(f"  {'':<24}" + "".join(f"{d:>8g}" for d in distances))
+        for name, row in zip(sweep["zoids"], sweep["profile"][t]):
+            if row is not None:
+                print(f"  {name:<24}" + "".join(f"{rate:>8.2f}" for rate in row))
+
+
+if __name__ == "__main__":
+    main()
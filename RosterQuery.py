@@ -0,0 +1,300 @@
+import argparse
+import heapq
+import json
+import random
+import re
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+
+# Numeric fields a query can filter or sort on, besides one field per power
+# type (its Rank, 0 when a Zoid doesn't have the power)
+FIELDS = {
+    "Fighting": lambda z: z["Stats"].get("Fighting", 0),
+    "Strength": lambda z: z["Stats"].get("Strength", 0),
+    "Dexterity": lambda z: z["Stats"].get("Dexterity", 0),
+    "Agility": lambda z: z["Stats"].get("Agility", 0),
+    "Awareness": lambda z: z["Stats"].get("Awareness", 0),
+    "Toughness": lambda z: z["Defenses"].get("Toughness", 0),
+    "Parry": lambda z: z["Defenses"].get("Parry", 0),
+    "Dodge": lambda z: z["Defenses"].get("Dodge", 0),
+    "Land": lambda z: z["Movement"].get("Land", 0),
+    "Water": lambda z: z["Movement"].get("Water", 0),
+    "Air": lambda z: z["Movement"].get("Air", 0),
+    "Power Level": lambda z: z.get("Power Level", 0),
+    "Total Power Points": lambda z: z.get("Total Power Points", 0),
+    "Cost": lambda z: z.get("Cost", 0),
+}
+TEXT_FIELDS = ["Name", "Faction"]
+
+# Shorthand terms: "air" means "Air > 0" and so on
+TERMS = {"land": ("Land", ">", 0), "water": ("Water", ">", 0), "air": ("Air", ">", 0)}
+
+PREDICATE = re.compile(r"^\s*(.+?)\s*(>=|<=|!=|==|=|>|<)\s*(.+?)\s*$")
+
+# Fields with at most this many distinct values get one bitmap per value;
+# busier fields (Cost on a big roster) get this many buckets instead
+MAX_CODES = 255
+
+
+def parse_predicate(text):
+    if text.lower() in TERMS:
+        return TERMS[text.lower()]
+    match = PREDICATE.match(text)
+    if not match:
+        # A bare power name means "has that power"
+        return (text.strip(), ">", 0)
+    field, op, value = match.groups()
+    op = "==" if op == "=" else op
+    try:
+        return (field, op, float(value))
+    except ValueError:
+        return (field, op, value)
+
+
+class RosterIndex:
+    # Row sets are Python ints used as bitmaps (bit r set = row r matches), so
+    # combining predicates is a handful of big-int ANDs however many rows
+    # match. Per field we keep the raw values as a column plus bitmaps of the
+    # rows at or above each distinct value; for power types that is the
+    # inverted index from rank to the Zoids with at least that rank.
+    # Everything is built once, when the index is created.
+    def __init__(self, zoids):
+        self.zoids = zoids
+        self.size = len(zoids)
+        self.all = (1 << self.size) - 1
+        self.columns = {field: array("d", (get(z) for z in zoids)) for field, get in FIELDS.items()}
+        power_types = sorted({p["Type"] for z in zoids for p in z.get("Powers", [])})
+        for power_type in power_types:
+            self.columns[power_type] = array("d", bytes(8 * self.size))
+        for row, z in enumerate(zoids):
+            for power in z.get("Powers", []):
+                self.columns[power["Type"]][row] = power.get("Rank", 0)
+
+        self.text = {field: {} for field in TEXT_FIELDS}
+        for row, z in enumerate(zoids):
+            self.text["Name"].setdefault(z["Name"].lower(), []).append(row)
+            self.text["Faction"].setdefault(z.get("Faction", "Unknown").lower(), []).append(row)
+
+        self.names = {name.lower(): name for name in list(self.columns) + TEXT_FIELDS}
+        self._text_bits = {}
+        self.codes = {field: self._build_codes(field) for field in self.columns}
+
+    def field(self, name):
+        try:
+            return self.names[name.lower()]
+        except KeyError:
+            raise ValueError(f"Unknown field: {name}") from None
+
+    def _bitmap(self, flags):
+        # flags: bytes of b"0"/b"1", one per row
+        return int(flags[::-1], 2) if flags else 0
+
+    def _rows_bitmap(self, rows):
+        if len(rows) <= 8:
+            bits = 0
+            for row in rows:
+                bits |= 1 << row
+            return bits
+        flags = bytearray(b"0" * self.size)
+        for row in rows:
+            flags[row] = 49
+        return self._bitmap(bytes(flags))
+
+    def _ge_bitmaps(self, codes, count):
+        # ge[i]: rows whose code is at least i, for codes 0..count-1
+        ge = []
+        for i in range(count):
+            table = bytes(49 if code >= i else 48 for code in range(256))
+            ge.append(self._bitmap(codes.translate(table)))
+        ge.append(0)
+        return ge
+
+    def _build_codes(self, field):
+        # Low-cardinality fields (stats, ranks, Power Level) get one bitmap per
+        # distinct value. Others are sorted and cut into MAX_CODES buckets of
+        # rows; a bound inside a bucket is patched up from the sorted rows.
+        column = self.columns[field]
+        values = sorted(set(column))
+        if len(values) <= MAX_CODES:
+            code_of = {value: i for i, value in enumerate(values)}
+            codes = bytes(map(code_of.__getitem__, column))
+            return {"values": values, "ge": self._ge_bitmaps(codes, len(values))}
+        rows = sorted(range(self.size), key=column.__getitem__)
+        step = -(-self.size // MAX_CODES)
+        bounds = list(range(0, self.size, step))
+        bucket = bytearray(self.size)
+        for position, row in enumerate(rows):
+            bucket[row] = position // step
+        return {
+            "sorted": [column[row] for row in rows],
+            "rows": rows,
+            "bounds": bounds,
+            "ge": self._ge_bitmaps(bytes(bucket), len(bounds)),
+        }
+
+    def _at_least(self, field, value, strict):
+        codes = self.codes[field]
+        if "values" in codes:
+            values = codes["values"]
+            return codes["ge"][bisect_right(values, value) if strict else bisect_left(values, value)]
+        values, rows, bounds = codes["sorted"], codes["rows"], codes["bounds"]
+        lo = bisect_right(values, value) if strict else bisect_left(values, value)
+        k = bisect_right(bounds, lo) - 1
+        bits = codes["ge"][k]
+        if lo > bounds[k]:
+            bits &= ~self._rows_bitmap(rows[bounds[k]:lo])
+        return bits
+
+    def _text_bitmap(self, field, value):
+        key = (field, value)
+        if key not in self._text_bits:
+            self._text_bits[key] = self._rows_bitmap(self.text[field].get(value, []))
+        return self._text_bits[key]
+
+    def match(self, field, op, value):
+        if field in self.text:
+            if op not in ("==", "!="):
+                raise ValueError(f"{field} only supports = and !=")
+            rows = self._text_bitmap(field, str(value).lower())
+            return rows if op == "==" else self.all & ~rows
+        try:
+            value = float(value)
+        except ValueError:
+            raise ValueError(f"{field} needs a number, not {value!r}") from None
+        if op == ">=":
+            return self._at_least(field, value, False)
+        if op == ">":
+            return self._at_least(field, value, True)
+        if op == "<":
+            return self.all & ~self._at_least(field, value, False)
+        if op == "<=":
+            return self.all & ~self._at_least(field, value, True)
+        equal = self._at_least(field, value, False) & ~self._at_least(field, value, True)
+        return equal if op == "==" else self.all & ~equal
+
+    def _rows(self, bits, limit=None):
+        flags = format(bits, f"0{self.size}b")[::-1]
+        rows = []
+        row = flags.find("1")
+        while row != -1 and len(rows) != limit:
+            rows.append(row)
+            row = flags.find("1", row + 1)
+        return rows
+
+    def _in_order(self, bits, field, descending, limit):
+        # Matching rows sorted by field (ties by row), stopping once there are
+        # limit of them
+        codes = self.codes[field]
+        ge = codes["ge"]
+        # Binary search for the first code (bucket) holding a match, since
+        # ge[i] shrinks as i grows; then walk from there
+        lo, hi = 0, len(ge) - 2
+        while lo < hi:
+            if descending:
+                mid = (lo + hi + 1) // 2
+                lo, hi = (mid, hi) if bits & ge[mid] else (lo, mid - 1)
+            else:
+                mid = (lo + hi) // 2
+                lo, hi = (lo, mid) if bits & ge[mid + 1] != bits else (mid + 1, hi)
+        order = range(lo, -1, -1) if descending else range(lo, len(ge) - 1)
+        if "bounds" in codes:
+            # Buckets hold consecutive runs of the sorted rows, so only the
+            # first buckets with matches need sorting. Rows tied with the
+            # last value kept can sit in later buckets too; those come from
+            # the equality bitmap, which lists them by row.
+            column = self.columns[field]
+            sign = -1 if descending else 1
+            found = []
+            for k in order:
+                part = bits & ge[k] & ~ge[k + 1]
+                if part:
+                    found.extend(self._rows(part))
+                    if len(found) >= limit:
+                        break
+            found.sort(key=lambda row: (sign * column[row], row))
+            if len(found) <= limit:
+                return found
+            cutoff = column[found[limit - 1]]
+            better = [row for row in found[:limit] if column[row] != cutoff]
+            return better + self._rows(bits & self.match(field, "==", cutoff), limit - len(better))
+        found = []
+        for i in order:
+            part = bits & ge[i] & ~ge[i + 1]
+            if not part:
+                continue
+            found.extend(self._rows(part, limit - len(found)))
+            if len(found) >= limit:
+                break
+        return found
+
+    def query(self, predicates=(), sort_by=None, descending=False, limit=None):
+        # predicates: (field, op, value) tuples or strings like "E-Shield>=5",
+        # all of which must hold. Returns matching records, at most limit of
+        # them unless limit is None.
+        if limit is not None and limit <= 0:
+            return []
+        bits = self.all
+        for predicate in predicates:
+            field, op, value = parse_predicate(predicate) if isinstance(predicate, str) else predicate
+            bits &= self.match(self.field(field), op, value)
+            if not bits:
+                return []
+
+        if sort_by is None:
+            rows = self._rows(bits, limit)
+        elif limit and bits.bit_count() > 50 * limit:
+            rows = self._in_order(bits, self.field(sort_by), descending, limit)
+        else:
+            column = self.columns[self.field(sort_by)]
+            key = (lambda row: (-column[row], row)) if descending else (lambda row: (column[row], row))
+            rows = self._rows(bits)
+            rows = sorted(rows, key=key) if limit is None else heapq.nsmallest(limit, rows, key=key)
+        return [self.zoids[row] for row in rows]
+
+
+def synthetic_roster(zoids, n, seed=0):
+    # n records sampled from a real roster for benchmarking. They share the
+    # nested Stats/Powers data of the Zoid they were copied from, which keeps
+    # a million-row roster small enough to build in memory.
+    rng = random.Random(seed)
+    return [dict(base, Name=f"{base['Name']} #{i}", Cost=base["Cost"] + rng.randint(-10, 10) * 350)
+            for i, base in ((i, rng.choice(zoids)) for i in range(n))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query the Zoid roster")
+    parser.add_argument("where", nargs="*",
+                        help='conditions, all of which must hold, e.g. air "E-Shield>=5" "Long-Range>=6"')
+    parser.add_argument("--stats", default="ConvertedZoidStats.json")
+    parser.add_argument("--sort", help="field to sort by")
+    parser.add_argument("--desc", action="store_true")
+    parser.add_argument("--limit", type=int)
+    parser.add_argument("--fields", default="Power Level,Cost", help="comma-separated fields to show")
+    parser.add_argument("--synthetic", type=int, help="query a synthetic roster of this many rows instead")
+    args = parser.parse_args(argv)
+
+    with open(args.stats, "r", encoding="utf-8") as f:
+        zoids = json.load(f)
+    if args.synthetic:
+        zoids = synthetic_roster(zoids, args.synthetic)
+    index = RosterIndex(zoids)
+    try:
+        shown = [index.field(name.strip()) for name in args.fields.split(",") if name.strip()]
+        shown = [name for name in shown if name in index.columns]
+        start = time.perf_counter()
+        results = index.query(args.where, args.sort, args.desc, args.limit)
+        elapsed = (time.perf_counter() - start) * 1000
+    except ValueError as e:
+        parser.error(str(e))
+    for z in results[:50]:
+        row = index.text["Name"][z["Name"].lower()][0]
+        values = ", ".join(f"{name}={index.columns[name][row]:g}" for name in shown)
+        print(f"{z['Name']} ({z.get('Faction', 'Unknown')}): {values}")
+    if len(results) > 50:
+        print(f"... and {len(results) - 50} more")
+    print(f"\n{len(results)} of {len(zoids)} Zoids match ({elapsed:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+import argparse
+import glob
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+# Reads the DokuWiki pages written by sheetGen.format_zoid back into roster
+# records, so edits made on the wiki can be synced into ConvertedZoidStats.json.
+
+TITLE = re.compile(r"^======\s*(.+?)\s*======$")
+SECTION = re.compile(r"^=====\s*(.+?)\s*=====$")
+DETAIL = re.compile(r"^\*\*(.+?)\*\*:\s*(.*)$")
+NUMBER = re.compile(r"^-?\d+(\.\d+)?$")
+
+SUMMARY_FIELDS = {
+    "Total Power Points": "Total Power Points",
+    "Power Level": "Power Level",
+    "Power Level Source(s)": "Power Level Source",
+    "Cost": "Cost",
+}
+
+
+def parse_value(text):
+    text = text.strip()
+    if NUMBER.match(text):
+        return float(text) if "." in text else int(text)
+    return text
+
+
+def _cells(line):
+    return [cell.strip() for cell in line.strip().strip("|").split("|")]
+
+
+def _parse_power(power_type, details):
+    power = {"Type": power_type}
+    if details == "—":
+        return power
+    for part in details.split(" \\\\ "):
+        match = DETAIL.match(part.strip())
+        if not match:
+            continue
+        key, value = match.groups()
+        power[key] = [v.strip() for v in value.split(",")] if key == "Extras" else parse_value(value)
+    return power
+
+
+def parse_sheet(lines, path="<sheet>"):
+    # Streams over the page a line at a time; `lines` can be an open file.
+    # Table rows without a key and a value are reported and skipped.
+    zoid = {}
+    section = None
+    for lineno, line in enumerate(lines, 1):
+        line = line.rstrip("\n")
+        match = TITLE.match(line)
+        if match:
+            zoid["Name"] = match.group(1)
+            continue
+        match = SECTION.match(line)
+        if match:
+            section = match.group(1)
+            if section in ("Stats", "Defenses", "Movement"):
+                zoid[section] = {}
+            elif section == "Powers":
+                zoid["Powers"] = []
+            continue
+        if not line.startswith("|"):
+            continue
+        cells = _cells(line)
+        if len(cells) < 2:
+            print(f"{path}:{lineno}: skipping malformed row: {line}")
+            continue
+        key, value = cells[:2]
+        if section in ("Stats", "Defenses"):
+            zoid[section][key] = parse_value(value)
+        elif section == "Movement":
+            zoid["Movement"][key] = parse_value(value.replace("m/6s", ""))
+        elif section == "Powers":
+            zoid["Powers"].append(_parse_power(key, value))
+        elif section == "Summary" and key in SUMMARY_FIELDS:
+            if key == "Power Level Source(s)":
+                zoid["Power Level Source"] = [v.strip() for v in value.split(",") if v.strip()]
+            elif key == "Cost":
+                zoid["Cost"] = parse_value(value.replace("Credits", ""))
+            else:
+                zoid[SUMMARY_FIELDS[key]] = parse_value(value)
+    return zoid
+
+
+def parse_sheet_file(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return parse_sheet(f, path)
+
+
+def parse_directory(directory, workers=None):
+    paths = sorted(glob.glob(os.path.join(directory, "*_rp.txt")))
+    if workers == 1 or len(paths) < 2:
+        return [parse_sheet_file(path) for path in paths]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(parse_sheet_file, paths, chunksize=max(1, len(paths) // 32)))
+
+
+def _powers_by_type(powers):
+    return {p["Type"]: p for p in powers}
+
+
+def diff_zoid(old, new):
+    # Only fields the sheet carries are compared (Faction isn't on the page)
+    changes = []
+    for key, value in new.items():
+        if key == "Powers":
+            old_powers, new_powers = _powers_by_type(old.get("Powers", [])), _powers_by_type(value)
+            for power_type in sorted(set(old_powers) | set(new_powers)):
+                if power_type not in new_powers:
+                    changes.append((f"Powers/{power_type}", old_powers[power_type], None))
+                elif power_type not in old_powers:
+                    changes.append((f"Powers/{power_type}", None, new_powers[power_type]))
+                else:
+                    for field in sorted(set(old_powers[power_type]) | set(new_powers[power_type])):
+                        a, b = old_powers[power_type].get(field), new_powers[power_type].get(field)
+                        if a != b:
+                            changes.append((f"Powers/{power_type}/{field}", a, b))
+        elif isinstance(value, dict):
+            for field in sorted(set(old.get(key, {})) | set(value)):
+                a, b = old.get(key, {}).get(field), value.get(field)
+                if a != b:
+                    changes.append((f"{key}/{field}", a, b))
+        elif old.get(key) != value:
+            changes.append((key, old.get(key), value))
+    return changes
+
+
+def diff_roster(roster, sheets):
+    by_name = {z["Name"]: z for z in roster}
+    diffs = {}
+    for sheet in sheets:
+        name = sheet.get("Name")
+        if name is None:
+            continue
+        if name not in by_name:
+            diffs[name] = None
+            continue
+        changes = diff_zoid(by_name[name], sheet)
+        if changes:
+            diffs[name] = changes
+    return diffs
+
+
+def merge_roster(roster, sheets):
+    # Sheet values win; fields the sheet doesn't carry are kept from the roster
+    merged = [dict(z) for z in roster]
+    index = {z["Name"]: i for i, z in enumerate(merged)}
+    for sheet in sheets:
+        name = sheet.get("Name")
+        if name is None:
+            continue
+        if name in index:
+            merged[index[name]].update(sheet)
+        else:
+            record = {"Name": name, "Faction": "Unknown"}
+            record.update(sheet)
+            merged.append(record)
+            index[name] = len(merged) - 1
+    return merged
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sync edited wiki sheets back into the roster")
+    parser.add_argument("directory", nargs="?", default="ZoidTextFiles")
+    parser.add_argument("--stats", default="ConvertedZoidStats.json")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--write", action="store_true", help="save the merged roster over --stats")
+    args = parser.parse_args(argv)
+
+    with open(args.stats, "r", encoding="utf-8") as f:
+        roster = json.load(f)
+    sheets = parse_directory(args.directory, args.workers)
+    diffs = diff_roster(roster, sheets)
+    for name, changes in sorted(diffs.items()):
+        if changes is None:
+            print(f"{name}: new Zoid")
+            continue
+        print(f"{name}:")
+        for path, old, new in changes:
+            print(f"  {path}: {old} -> {new}")
+    print(f"\nParsed {len(sheets)} sheets, {len(diffs)} differ from {args.stats}")
+    if args.write and diffs:
+        with open(args.stats, "w", encoding="utf-8") as f:
+            json.dump(merge_roster(roster, sheets), f, indent=4)
+        print(f"Updated {args.stats}")
+
+
+if __name__ == "__main__":
+    main()
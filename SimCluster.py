@@ -0,0 +1,211 @@
+import argparse
+import json
+import socket
+import socketserver
+import threading
+import zlib
+from collections import deque
+
+from ZoidsGame import load_zoids, filter_zoids
+from ZoidsSim import compile_zoids, estimate_win_rate
+
+# Line-delimited JSON over TCP. A worker sends {"type": "ready"} to ask for
+# work and gets back {"type": "chunk", ...} or {"type": "done"}; the first
+# chunk on a connection also carries the roster, so every worker simulates
+# the coordinator's stats. While running a chunk the worker sends
+# {"type": "progress"} after each pair, and when it finishes it sends
+# {"type": "result", "chunk": id, "results": [...]} and is handed the next
+# chunk in reply. A worker that stays silent for longer than the timeout is
+# dropped and its chunk goes back in the queue.
+
+
+def _send(stream, message):
+    stream.write((json.dumps(message) + "\n").encode("utf-8"))
+    stream.flush()
+
+
+def _receive(stream):
+    line = stream.readline()
+    return json.loads(line) if line else None
+
+
+def make_chunks(zoids, battle_type, chunk_size=25):
+    names = sorted(z["Name"] for z in filter_zoids(zoids, battle_type))
+    pairs = [(a, b) for i, a in enumerate(names) for b in names[i + 1:]]
+    return [pairs[i:i + chunk_size] for i in range(0, len(pairs), chunk_size)]
+
+
+def pair_seed(seed, a, b):
+    # Depends only on the pair, so results do not change with chunking or
+    # with which worker ends up running a chunk
+    return zlib.crc32(f"{seed}:{a}|{b}".encode("utf-8"))
+
+
+def run_chunk(compiled, pairs, settings, progress=None):
+    results = []
+    for a, b in pairs:
+        result = estimate_win_rate(compiled[a], compiled[b], settings["battle_type"], settings["distance"],
+                                   settings["width"], seed=pair_seed(settings["seed"], a, b))
+        results.append({"a": a, "b": b, "win_rate": result["win_rate"], "ci": list(result["ci"]),
+                        "duels": result["duels"]})
+        if progress is not None:
+            progress()
+    return results
+
+
+class Coordinator(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, chunks, settings, roster, timeout=60.0):
+        super().__init__(address, _WorkerHandler)
+        self.settings = settings
+        self.roster = roster
+        self.worker_timeout = timeout
+        self.chunks = dict(enumerate(chunks))
+        self.pending = deque(self.chunks)
+        self.results = {}
+        self.lock = threading.Lock()
+        self.finished = threading.Event()
+        if not self.chunks:
+            self.finished.set()
+
+    def next_chunk(self):
+        with self.lock:
+            while self.pending:
+                chunk_id = self.pending.popleft()
+                if chunk_id not in self.results:
+                    return chunk_id
+            return None
+
+    def complete(self, chunk_id, results):
+        with self.lock:
+            self.results.setdefault(chunk_id, results)
+            if len(self.results) == len(self.chunks):
+                self.finished.set()
+
+    def requeue(self, chunk_id):
+        with self.lock:
+            if chunk_id not in self.results:
+                self.pending.appendleft(chunk_id)
+
+    def collect(self):
+        # Merged in chunk order, so the output is the same whatever order
+        # workers finished in
+        return [row for chunk_id in sorted(self.results) for row in self.results[chunk_id]]
+
+
+class _WorkerHandler(socketserver.StreamRequestHandler):
+    def setup(self):
+        # Reads time out on a hung or silently disconnected worker
+        self.timeout = self.server.worker_timeout
+        super().setup()
+
+    def handle(self):
+        server = self.server
+        assigned = None
+        roster_sent = False
+        try:
+            while True:
+                message = _receive(self.rfile)
+                if message is None:
+                    break
+                if message["type"] == "progress":
+                    continue
+                if message["type"] == "result" and message["chunk"] == assigned:
+                    server.complete(assigned, message["results"])
+                    assigned = None
+                if assigned is None:
+                    assigned = server.next_chunk()
+                if assigned is None:
+                    # Nothing left to hand out; chunks still running elsewhere
+                    # come back here if their worker dies
+                    if server.finished.wait(timeout=1.0):
+                        _send(self.wfile, {"type": "done"})
+                        break
+                    _send(self.wfile, {"type": "wait"})
+                    continue
+                chunk = {"type": "chunk", "chunk": assigned, "pairs": server.chunks[assigned],
+                         "settings": server.settings}
+                if not roster_sent:
+                    chunk["roster"] = server.roster
+                    roster_sent = True
+                _send(self.wfile, chunk)
+        except (OSError, ValueError):
+            pass
+        finally:
+            if assigned is not None:
+                server.requeue(assigned)
+
+
+def run_coordinator(zoids, battle_type, host="127.0.0.1", port=5055, chunk_size=25, distance=500,
+                    width=0.1, seed=0, timeout=60.0):
+    settings = {"battle_type": battle_type, "distance": distance, "width": width, "seed": seed}
+    server = Coordinator((host, port), make_chunks(zoids, battle_type, chunk_size), settings,
+                         filter_zoids(zoids, battle_type), timeout)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    print(f"Coordinator on {host}:{server.server_address[1]} with {len(server.chunks)} chunks")
+    server.finished.wait()
+    server.shutdown()
+    server.server_close()
+    return server.collect()
+
+
+def run_worker(host="127.0.0.1", port=5055):
+    compiled = {}
+    with socket.create_connection((host, port)) as sock:
+        stream = sock.makefile("rwb")
+        _send(stream, {"type": "ready"})
+        chunks_done = 0
+        while True:
+            message = _receive(stream)
+            if message is None or message["type"] == "done":
+                break
+            if message["type"] == "wait":
+                _send(stream, {"type": "ready"})
+                continue
+            if "roster" in message:
+                compiled = compile_zoids(message["roster"])
+            results = run_chunk(compiled, message["pairs"], message["settings"],
+                                lambda: _send(stream, {"type": "progress"}))
+            _send(stream, {"type": "result", "chunk": message["chunk"], "results": results})
+            chunks_done += 1
+    return chunks_done
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Distributed Monte Carlo matchup runs")
+    sub = parser.add_subparsers(dest="role", required=True)
+    coordinator = sub.add_parser("coordinator")
+    coordinator.add_argument("--stats", default="ConvertedZoidStats.json")
+    coordinator.add_argument("--battle-type", choices=["land", "water", "air"], default="land")
+    coordinator.add_argument("--host", default="127.0.0.1")
+    coordinator.add_argument("--port", type=int, default=5055)
+    coordinator.add_argument("--chunk-size", type=int, default=25)
+    coordinator.add_argument("--distance", type=float, default=500)
+    coordinator.add_argument("--width", type=float, default=0.1)
+    coordinator.add_argument("--seed", type=int, default=0)
+    coordinator.add_argument("--timeout", type=float, default=60.0,
+                             help="seconds of worker silence before its chunk is handed out again")
+    coordinator.add_argument("--output", help="write merged results as JSON")
+    worker = sub.add_parser("worker")
+    worker.add_argument("--host", default="127.0.0.1")
+    worker.add_argument("--port", type=int, default=5055)
+    args = parser.parse_args(argv)
+
+    if args.role == "worker":
+        chunks_done = run_worker(args.host, args.port)
+        print(f"Worker finished after {chunks_done} chunks")
+        return
+
+    results = run_coordinator(load_zoids(args.stats), args.battle_type, args.host, args.port, args.chunk_size,
+                              args.distance, args.width, args.seed, args.timeout)
+    print(f"Collected {len(results)} matchups, {sum(r['duels'] for r in results)} duels")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
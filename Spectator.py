@@ -0,0 +1,294 @@
+import argparse
+import copy
+import json
+import selectors
+import socket
+import threading
+import time
+from collections import deque
+
+# Live battle broadcasting. The battle calls BroadcastServer.publish with the
+# state after each turn; the server turns that into a delta against the
+# previous state, encodes it once, and queues the same bytes for every
+# viewer. Frames are line-delimited JSON:
+#   {"type": "state", ...}  full state, sent once when a viewer joins
+#   {"type": "delta", ...}  only the fields that changed since the last frame
+
+
+def zoid_state(zoid):
+    return {
+        "name": zoid.name,
+        "dents": zoid.dents,
+        "status": zoid.status,
+        "angle": round(zoid.angle, 1),
+        "position": zoid.position,
+        "shield_on": zoid.shield_on,
+        "shield_disabled": zoid.shieldDisabled,
+        "stealth_on": zoid.stealth_on,
+    }
+
+
+def battle_state(turn, distance, zoids, rolls=None):
+    return {
+        "turn": turn,
+        "distance": round(distance, 1),
+        "zoids": {str(player): zoid_state(zoid) for player, zoid in zoids.items()},
+        "rolls": list(rolls or []),
+    }
+
+
+def state_delta(old, new):
+    delta = {}
+    for key, value in new.items():
+        if isinstance(value, dict) and isinstance(old.get(key), dict):
+            nested = state_delta(old[key], value)
+            if nested:
+                delta[key] = nested
+        elif old.get(key) != value:
+            delta[key] = value
+    return delta
+
+
+def apply_delta(state, delta):
+    for key, value in delta.items():
+        if isinstance(value, dict) and isinstance(state.get(key), dict):
+            apply_delta(state[key], value)
+        else:
+            state[key] = value
+    return state
+
+
+def _encode(frame):
+    return (json.dumps(frame, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+class _Viewer:
+    def __init__(self, sock):
+        self.sock = sock
+        # Each frame is [frame dict, encoded bytes or None if it needs re-encoding]
+        self.frames = deque()
+        self.out = b""
+        self.coalesced = 0
+        self.events = selectors.EVENT_READ | selectors.EVENT_WRITE
+
+    def pending(self):
+        return bool(self.out or self.frames)
+
+
+class BroadcastServer:
+    # Viewers that fall behind never hold up the battle: once a viewer has
+    # max_frames queued, new deltas are folded into its newest queued frame
+    # instead, so it catches up on the current state and only loses
+    # intermediate turns (and their rolls).
+    def __init__(self, host="127.0.0.1", port=5060, max_frames=16):
+        self.max_frames = max_frames
+        self.state = {}
+        self.viewers = {}
+        self.lock = threading.Lock()
+        self.selector = selectors.DefaultSelector()
+        self.listener = socket.create_server((host, port))
+        self.listener.setblocking(False)
+        self.address = self.listener.getsockname()
+        self.selector.register(self.listener, selectors.EVENT_READ, "accept")
+        self.wake_r, self.wake_w = socket.socketpair()
+        self.wake_r.setblocking(False)
+        self.wake_w.setblocking(False)
+        self.selector.register(self.wake_r, selectors.EVENT_READ, "wake")
+        self.running = True
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+
+    def publish(self, state):
+        with self.lock:
+            delta = state_delta(self.state, state)
+            if "rolls" not in delta and state.get("rolls"):
+                delta["rolls"] = state["rolls"]
+            self.state = copy.deepcopy(state)
+            if not delta:
+                return
+            frame = dict(delta, type="delta")
+            encoded = _encode(frame)
+            for viewer in self.viewers.values():
+                if len(viewer.frames) >= self.max_frames:
+                    last = viewer.frames[-1]
+                    if last[1] is not None:
+                        # Still shared with other viewers; take a private copy
+                        last[0] = copy.deepcopy(last[0])
+                    apply_delta(last[0], delta)
+                    last[1] = None
+                    viewer.coalesced += 1
+                else:
+                    viewer.frames.append([frame, encoded])
+        self._wake()
+
+    def observer(self, turn, distance, zoids, rolls=None):
+        # Matches both ZoidsSim's on_turn and ZoidsGame.game_loop's observer
+        self.publish(battle_state(turn, distance, zoids, rolls))
+
+    def viewer_count(self):
+        with self.lock:
+            return len(self.viewers)
+
+    def close(self):
+        self.running = False
+        self._wake()
+        self.thread.join()
+        for viewer in list(self.viewers.values()):
+            viewer.sock.close()
+        self.listener.close()
+        self.wake_r.close()
+        self.wake_w.close()
+        self.selector.close()
+
+    def _wake(self):
+        try:
+            self.wake_w.send(b"\0")
+        except BlockingIOError:
+            pass
+
+    def _serve(self):
+        while self.running:
+            for key, events in self.selector.select(timeout=1.0):
+                if key.data == "accept":
+                    self._accept()
+                elif key.data == "wake":
+                    try:
+                        while self.wake_r.recv(4096):
+                            pass
+                    except BlockingIOError:
+                        pass
+                else:
+                    viewer = key.data
+                    if events & selectors.EVENT_READ:
+                        self._read(viewer)
+                    if events & selectors.EVENT_WRITE and viewer.sock.fileno() in self.viewers:
+                        self._flush(viewer)
+            self._update_interest()
+
+    def _accept(self):
+        sock, _ = self.listener.accept()
+        sock.setblocking(False)
+        viewer = _Viewer(sock)
+        with self.lock:
+            keyframe = dict(copy.deepcopy(self.state), type="state")
+            viewer.frames.append([keyframe, _encode(keyframe)])
+            self.viewers[sock.fileno()] = viewer
+        self.selector.register(sock, selectors.EVENT_READ | selectors.EVENT_WRITE, viewer)
+
+    def _read(self, viewer):
+        try:
+            data = viewer.sock.recv(4096)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            data = b""
+        if not data:
+            self._drop(viewer)
+
+    def _flush(self, viewer):
+        while True:
+            if not viewer.out:
+                with self.lock:
+                    if not viewer.frames:
+                        return
+                    frame, encoded = viewer.frames.popleft()
+                viewer.out = encoded if encoded is not None else _encode(frame)
+            try:
+                sent = viewer.sock.send(viewer.out)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                self._drop(viewer)
+                return
+            viewer.out = viewer.out[sent:]
+            if viewer.out:
+                return
+
+    def _update_interest(self):
+        with self.lock:
+            viewers = list(self.viewers.values())
+        for viewer in viewers:
+            events = selectors.EVENT_READ | (selectors.EVENT_WRITE if viewer.pending() else 0)
+            if events == viewer.events:
+                continue
+            try:
+                self.selector.modify(viewer.sock, events, viewer)
+                viewer.events = events
+            except (KeyError, ValueError):
+                pass
+
+    def _drop(self, viewer):
+        with self.lock:
+            self.viewers.pop(viewer.sock.fileno(), None)
+        try:
+            self.selector.unregister(viewer.sock)
+        except (KeyError, ValueError):
+            pass
+        viewer.sock.close()
+
+
+def watch(host="127.0.0.1", port=5060):
+    state = {}
+    with socket.create_connection((host, port)) as sock:
+        for line in sock.makefile("r", encoding="utf-8"):
+            frame = json.loads(line)
+            if frame.pop("type") == "state":
+                state = frame
+            else:
+                apply_delta(state, frame)
+            zoids = state.get("zoids", {})
+            if not zoids:
+                continue
+            z1, z2 = zoids["1"], zoids["2"]
+            print(f"Turn {state['turn']}: {state['distance']:.1f}m | "
+                  f"{z1['name']} {z1['status']} ({z1['dents']} dents) vs "
+                  f"{z2['name']} {z2['status']} ({z2['dents']} dents)"
+                  + (f" | rolls {frame['rolls']}" if frame.get("rolls") else ""))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Broadcast duels to spectators")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5060)
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve = sub.add_parser("serve", help="run a duel and broadcast it")
+    serve.add_argument("zoid1", nargs="?", help="simulate this matchup (omit to play interactively)")
+    serve.add_argument("zoid2", nargs="?")
+    serve.add_argument("--stats", default="ConvertedZoidStats.json")
+    serve.add_argument("--battle-type", choices=["land", "water", "air"], default="land")
+    serve.add_argument("--distance", type=float, default=1000)
+    serve.add_argument("--delay", type=float, default=1.0, help="seconds between simulated turns")
+    serve.add_argument("--seed", type=int)
+    serve.add_argument("--buffer", type=int, default=16, help="frames queued per viewer before coalescing")
+    sub.add_parser("watch", help="connect and print a live duel")
+    args = parser.parse_args(argv)
+
+    if args.command == "watch":
+        watch(args.host, args.port)
+        return
+
+    server = BroadcastServer(args.host, args.port, args.buffer)
+    print(f"Broadcasting on {server.address[0]}:{server.address[1]}")
+    try:
+        if args.zoid1 and args.zoid2:
+            from ZoidsGame import load_zoids
+            from ZoidsSim import compile_zoids, simulate_duel, DiceStream
+            compiled = compile_zoids(load_zoids(args.stats))
+
+            def on_turn(turn, distance, zoids, rolls):
+                server.observer(turn, distance, zoids, rolls)
+                time.sleep(args.delay)
+
+            winner = simulate_duel(compiled[args.zoid1], compiled[args.zoid2], args.battle_type, args.distance,
+                                   DiceStream(args.seed), on_turn=on_turn)
+            print(f"Winner: {[args.zoid1, args.zoid2][winner - 1] if winner else 'none (draw)'}")
+        else:
+            import ZoidsGame
+            ZoidsGame.main(server.observer)
+        time.sleep(args.delay)
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+import argparse
+import json
+import math
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from ZoidsGame import load_zoids, filter_zoids
+from ZoidsSim import SimZoid, DiceStream, simulate_duel
+
+FORMATS = ["round-robin", "swiss", "single-elimination", "double-elimination"]
+
+
+def match_seed(seed, match_id):
+    # Stable across runs and processes, unlike hash()
+    return zlib.crc32(f"{seed}:{match_id}".encode("utf-8"))
+
+
+def play_match(zoid_a, zoid_b, battle_type, distance, duels, seed, decisive=False):
+    # Best of `duels`. Decisive matches (eliminations) keep playing sudden
+    # death duels after a tie, then fall back to a coin flip.
+    a, b = SimZoid(zoid_a), SimZoid(zoid_b)
+    score_a = score_b = 0.0
+    played = 0
+    while played < duels or (decisive and score_a == score_b and played < duels * 3):
+        winner = simulate_duel(a, b, battle_type, distance, DiceStream(seed + played))
+        score_a += 1.0 if winner == 1 else 0.5 if winner == 0 else 0.0
+        score_b += 1.0 if winner == 2 else 0.5 if winner == 0 else 0.0
+        played += 1
+    if score_a == score_b and decisive:
+        winner = a.name if DiceStream(seed).coin() else b.name
+    else:
+        winner = a.name if score_a > score_b else b.name if score_b > score_a else None
+    return {"a": a.name, "b": b.name, "score": [score_a, score_b], "winner": winner}
+
+
+def _play(args):
+    match_id, zoid_a, zoid_b, battle_type, distance, duels, seed, decisive = args
+    return match_id, play_match(zoid_a, zoid_b, battle_type, distance, duels, seed, decisive)
+
+
+def standings(entrants, results):
+    table = {name: {"points": 0.0, "wins": 0, "losses": 0, "draws": 0} for name in entrants}
+    for result in results.values():
+        if result["b"] is None:
+            table[result["a"]]["points"] += 1
+            table[result["a"]]["wins"] += 1
+            continue
+        for name, other in ((result["a"], result["b"]), (result["b"], result["a"])):
+            if result["winner"] == name:
+                table[name]["points"] += 1
+                table[name]["wins"] += 1
+            elif result["winner"] == other:
+                table[name]["losses"] += 1
+            else:
+                table[name]["points"] += 0.5
+                table[name]["draws"] += 1
+    return sorted(table.items(), key=lambda item: (-item[1]["points"], -item[1]["wins"], item[0]))
+
+
+def match_losses(entrants, results):
+    losses = {name: 0 for name in entrants}
+    for result in results.values():
+        if result["b"] is not None and result["winner"] is not None:
+            losses[result["b"] if result["winner"] == result["a"] else result["a"]] += 1
+    return losses
+
+
+# Schedulers yield one round at a time as a list of (match_id, a, b); b is
+# None for a bye. Every result records the round it was played in, and round
+# r is paired only from results of earlier rounds, so a run resumed from a
+# checkpoint (even one taken mid-round) regenerates exactly the same schedule.
+
+
+def _before(results, r):
+    return {match_id: res for match_id, res in results.items() if res["round"] < r}
+
+def _round_robin(entrants, results, options):
+    yield [(f"rr-{a}-vs-{b}", a, b) for i, a in enumerate(entrants) for b in entrants[i + 1:]]
+
+
+def _swiss(entrants, results, options):
+    rounds = options.get("rounds") or math.ceil(math.log2(max(2, len(entrants))))
+    seed_order = {name: i for i, name in enumerate(entrants)}
+    for r in range(1, rounds + 1):
+        earlier = _before(results, r)
+        met = {frozenset((res["a"], res["b"])) for res in earlier.values() if res["b"] is not None}
+        had_bye = {res["a"] for res in earlier.values() if res["b"] is None}
+        order = [name for name, _ in sorted(standings(entrants, earlier),
+                                            key=lambda item: (-item[1]["points"], seed_order[item[0]]))]
+        matches = []
+        if len(order) % 2:
+            bye = next((name for name in reversed(order) if name not in had_bye), order[-1])
+            order.remove(bye)
+            matches.append((f"swiss-{r}-{bye}-bye", bye, None))
+        while order:
+            a = order.pop(0)
+            # Highest-ranked opponent not met yet, else the next in line
+            b = next((name for name in order if frozenset((a, name)) not in met), order[0])
+            order.remove(b)
+            matches.append((f"swiss-{r}-{a}-vs-{b}", a, b))
+        yield matches
+
+
+def _elimination(entrants, results, options):
+    # Entrants are knocked out after `lives` match losses. Each round pairs
+    # survivors with the same number of losses, top seed against bottom seed,
+    # so with two lives this plays out as winners and losers brackets feeding
+    # a grand final (and a reset final if the losers-bracket side wins it).
+    lives = options["lives"]
+    r = 1
+    while True:
+        losses = match_losses(entrants, _before(results, r))
+        alive = [name for name in entrants if losses[name] < lives]
+        if len(alive) <= 1:
+            return
+        groups = {}
+        for name in alive:
+            groups.setdefault(losses[name], []).append(name)
+        if len(groups) > 1 and all(len(group) == 1 for group in groups.values()):
+            # Grand final between the last survivor of each bracket
+            a, b = alive
+            yield [(f"elim-{r}-{a}-vs-{b}", a, b)]
+            r += 1
+            continue
+        matches = []
+        for lost, group in sorted(groups.items()):
+            if len(group) % 2:
+                matches.append((f"elim-{r}-{group[0]}-bye", group[0], None))
+                group = group[1:]
+            for i in range(len(group) // 2):
+                a, b = group[i], group[-1 - i]
+                matches.append((f"elim-{r}-{a}-vs-{b}", a, b))
+        yield matches
+        r += 1
+
+
+SCHEDULERS = {
+    "round-robin": (_round_robin, {}),
+    "swiss": (_swiss, {}),
+    "single-elimination": (_elimination, {"lives": 1}),
+    "double-elimination": (_elimination, {"lives": 2}),
+}
+
+
+def load_checkpoint(path, fmt, entrants):
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        state = json.load(f)
+    if state["format"] != fmt or state["entrants"] != entrants:
+        raise ValueError(f"Checkpoint {path} is for a different tournament")
+    if any("round" not in result for result in state["results"].values()):
+        raise ValueError(f"Checkpoint {path} has no round numbers and can't be resumed")
+    return state["results"]
+
+
+def save_checkpoint(path, fmt, entrants, results):
+    if not path:
+        return
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"format": fmt, "entrants": entrants, "results": results}, f, indent=4)
+    os.replace(tmp_path, path)
+
+
+def run_tournament(zoids, fmt, battle_type, entrants=None, distance=500, duels=5, workers=None,
+                   checkpoint=None, checkpoint_every=20, seed=0, rounds=None):
+    roster = {z["Name"]: z for z in filter_zoids(zoids, battle_type)}
+    if entrants is None:
+        # Seed by Power Level, strongest first
+        entrants = sorted(roster, key=lambda name: (-roster[name].get("Power Level", 0), name))
+    missing = [name for name in entrants if name not in roster]
+    if missing:
+        raise ValueError(f"Not available for {battle_type} battles: {', '.join(missing)}")
+
+    results = load_checkpoint(checkpoint, fmt, entrants)
+    scheduler, options = SCHEDULERS[fmt]
+    options = dict(options, rounds=rounds)
+    decisive = fmt.endswith("elimination")
+    unsaved = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        try:
+            for r, matches in enumerate(scheduler(entrants, results, options), 1):
+                jobs = []
+                for match_id, a, b in matches:
+                    if match_id in results:
+                        continue
+                    if b is None:
+                        results[match_id] = {"a": a, "b": None, "score": [0, 0], "winner": a, "round": r}
+                        continue
+                    jobs.append(pool.submit(_play, (match_id, roster[a], roster[b], battle_type, distance,
+                                                    duels, match_seed(seed, match_id), decisive)))
+                for job in as_completed(jobs):
+                    match_id, result = job.result()
+                    results[match_id] = dict(result, round=r)
+                    unsaved += 1
+                    if unsaved >= checkpoint_every:
+                        save_checkpoint(checkpoint, fmt, entrants, results)
+                        unsaved = 0
+                save_checkpoint(checkpoint, fmt, entrants, results)
+                unsaved = 0
+        finally:
+            # Keep whatever finished if the run is interrupted
+            if unsaved:
+                save_checkpoint(checkpoint, fmt, entrants, results)
+    return entrants, results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a simulated Zoid tournament")
+    parser.add_argument("format", choices=FORMATS)
+    parser.add_argument("zoids", nargs="*", help="entrants in seed order (default: whole roster by PL)")
+    parser.add_argument("--stats", default="ConvertedZoidStats.json")
+    parser.add_argument("--battle-type", choices=["land", "water", "air"], default="land")
+    parser.add_argument("--distance", type=float, default=500)
+    parser.add_argument("--duels", type=int, default=5, help="duels per match")
+    parser.add_argument("--rounds", type=int, help="Swiss rounds (default log2 of entrants)")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--checkpoint", help="file to save progress to and resume from")
+    parser.add_argument("--checkpoint-every", type=int, default=20, help="matches between checkpoints")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    zoids = load_zoids(args.stats)
+    entrants, results = run_tournament(zoids, args.format, args.battle_type, args.zoids or None, args.distance,
+                                       args.duels, args.workers, args.checkpoint, args.checkpoint_every,
+                                       args.seed, args.rounds)
+    print(f"\n{args.format} ({args.battle_type}), {len(results)} matches")
+    if args.format.endswith("elimination"):
+        losses = match_losses(entrants, results)
+        champion = min(entrants, key=lambda name: losses[name])
+        print(f"Champion: {champion}\n")
+    for place, (name, row) in enumerate(standings(entrants, results), 1):
+        print(f"{place:>3}. {name}: {row['points']:g} pts ({row['wins']}W {row['losses']}L {row['draws']}D)")
+
+
+if __name__ == "__main__":
+    main()
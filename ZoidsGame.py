@@ -165,8 +165,18 @@ def is_attack_in_shield_arc(attacker,defender):
         rel_angle = 360 - rel_angle
     return abs(rel_angle) <= 45
 
+# Dice rolled since the observer was last called, so spectators see them too
+turn_rolls = []
+
 def d20():
-    return random.randint(1, 20)
+    roll = random.randint(1, 20)
+    turn_rolls.append(roll)
+    return roll
+
+def coin():
+    flip = random.choice([True, False])
+    turn_rolls.append("heads" if flip else "tails")
+    return flip
 
 def search_check(searcher: Zoid, target: Zoid):
     roll = d20()
@@ -189,12 +199,19 @@ def max_circling_angle(speed, distance):
     return min(360, (speed * 180) / (math.pi * distance))
 
 
-def game_loop(z1, z2, battle_type):
+def game_loop(z1, z2, battle_type, observer=None):
+    # observer, if given, is called with (turn, distance, zoids, rolls) before
+    # each turn and once more when the battle ends; rolls are the dice rolled
+    # since the previous call
     zoid_objs = {1: z1, 2: z2}
     order = pick_first(z1, z2)
     turn = 0
     distance = get_starting_distance()
+    turn_rolls.clear()
     while z1.status != "defeated" and z2.status != "defeated":
+        if observer:
+            observer(turn, distance, zoid_objs, list(turn_rolls))
+        turn_rolls.clear()
         player = order[turn % 2]
         zoid = zoid_objs[player]
         enemy = zoid_objs[1 if player == 2 else 2]
@@ -260,7 +277,7 @@ def game_loop(z1, z2, battle_type):
                     # Miss chance if enemy is still concealed
                     if enemy.stealth_on and not enemyDetected:
                         print("Target is concealed! 50% miss chance.")
-                        if random.choice([True, False]):
+                        if coin():
                             print("Your attack misses the target's last known location!")
                             did_attack = True
                             # End attack phase
@@ -274,31 +291,31 @@ def game_loop(z1, z2, battle_type):
                         damage = 0
                         if range == "melee":
                             damage = zoid.melee
-                            attack_roll = random.randint(1, 20) + zoid.fighting + zoid.close_combat
+                            attack_roll = d20() + zoid.fighting + zoid.close_combat
                             defense_roll = 10 + enemy.parry
                         elif range == "close":
                             damage = zoid.close_range
-                            attack_roll = random.randint(1, 20) + zoid.dexterity + zoid.ranged_combat
+                            attack_roll = d20() + zoid.dexterity + zoid.ranged_combat
                             defense_roll = 10 + enemy.dodge
                         elif range == "mid":
                             damage = zoid.mid_range
-                            attack_roll = random.randint(1, 20) + zoid.dexterity + zoid.ranged_combat
+                            attack_roll = d20() + zoid.dexterity + zoid.ranged_combat
                             defense_roll = 10 + enemy.dodge
                         elif range == "long":
                             damage = zoid.long_range
-                            attack_roll = random.randint(1, 20) + zoid.dexterity + zoid.ranged_combat
+                            attack_roll = d20() + zoid.dexterity + zoid.ranged_combat
                             defense_roll = 10 + enemy.dodge
                         did_hit = attack_roll >= defense_roll
                         if did_hit:
                             print(f"Attack roll: {attack_roll} vs Defense roll: {defense_roll}")
                             print(f"{zoid.name} hits {enemy.name} for {damage} damage!")
                             if enemy.has_shield() and enemy.shield_on and is_attack_in_shield_arc(zoid, enemy):
-                                shield_roll = random.randint(1, 20) + enemy.shield
+                                shield_roll = d20() + enemy.shield
                                 if shield_roll >= damage + 15:
                                     enemy.shieldDisabled = True
                                     print(f"{enemy.name}'s shield is disabled!")
                             else:
-                                toughness_roll = random.randint(1, 20) + enemy.toughness - enemy.dents
+                                toughness_roll = d20() + enemy.toughness - enemy.dents
                                 print(f"Enemy toughness roll: {toughness_roll} (Toughness: {enemy.toughness}, Dents: {enemy.dents})")
                                 damageDifference = damage + 15 - toughness_roll
                                 if damageDifference <= 0:
@@ -336,6 +353,8 @@ def game_loop(z1, z2, battle_type):
             zoid.status = "intact"
 
         turn += 1
+    if observer:
+        observer(turn, distance, zoid_objs, list(turn_rolls))
 
 def Movement(battle_type, distance, zoid, did_move, enemyDetected, enemyZoid):
     speed = zoid.get_speed(battle_type)
@@ -343,7 +362,7 @@ def Movement(battle_type, distance, zoid, did_move, enemyDetected, enemyZoid):
     if not enemyDetected:
         move = input("Enemy is concealed! 1: Search for Enemy  2: Stand Still\nChoice: ")
         if move == "1":
-            direction = random.choice(['closer', 'retreat'])
+            direction = 'closer' if coin() else 'retreat'
             if direction == 'closer':
                 zoid.position = 'close'
                 distance = max(0, distance - speed * 0.5)
@@ -403,7 +422,7 @@ def ShieldAndStealth(zoid):
         if st_toggle.lower().startswith('y'):
             zoid.stealth_on = not zoid.stealth_on
 
-def main():
+def main(observer=None):
     zoids = load_zoids("ConvertedZoidStats.json")
     battle_type = pick_battle_type()
     filtered_zoids = filter_zoids(zoids, battle_type)
@@ -413,7 +432,7 @@ def main():
     player1_zoid = choose_zoid(filtered_zoids, 1)
     player2_zoid = choose_zoid(filtered_zoids, 2)
     print(f"\nPlayer 1: {player1_zoid.name} vs Player 2: {player2_zoid.name}")
-    game_loop(player1_zoid, player2_zoid, battle_type)
+    game_loop(player1_zoid, player2_zoid, battle_type, observer)
 
 if __name__ == "__main__":
     main()
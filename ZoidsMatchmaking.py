@@ -0,0 +1,171 @@
+import argparse
+import heapq
+import json
+import math
+
+from ZoidsGame import load_zoids, filter_zoids
+from ZoidsSim import compile_zoids, estimate_win_rate
+
+
+def _power_rank(zoid_data, power_type):
+    return next((p.get('Rank', 0) for p in zoid_data.get("Powers", []) if p['Type'] == power_type), 0)
+
+
+# Features used to place a Zoid in stat space for nearest-neighbour lookups
+STAT_FEATURES = [
+    ("Fighting", lambda z: z["Stats"].get("Fighting", 0)),
+    ("Dexterity", lambda z: z["Stats"].get("Dexterity", 0)),
+    ("Toughness", lambda z: z["Defenses"].get("Toughness", 0)),
+    ("Land", lambda z: z["Movement"].get("Land", 0)),
+    ("Water", lambda z: z["Movement"].get("Water", 0)),
+    ("Air", lambda z: z["Movement"].get("Air", 0)),
+    ("Melee", lambda z: _power_rank(z, "Melee")),
+    ("Close-Range", lambda z: _power_rank(z, "Close-Range")),
+    ("Mid-Range", lambda z: _power_rank(z, "Mid-Range")),
+    ("Long-Range", lambda z: _power_rank(z, "Long-Range")),
+    ("E-Shield", lambda z: _power_rank(z, "E-Shield")),
+    ("Concealment", lambda z: _power_rank(z, "Concealment")),
+]
+
+
+def stat_vector(zoid_data):
+    return [float(get(zoid_data)) for _, get in STAT_FEATURES]
+
+
+def build_win_rate_matrix(zoids, battle_type, distance=500, target_width=0.1, seed=0):
+    compiled = compile_zoids(filter_zoids(zoids, battle_type))
+    names = sorted(compiled)
+    rates = [[0.5] * len(names) for _ in names]
+    for i, a in enumerate(names):
+        for j in range(i + 1, len(names)):
+            result = estimate_win_rate(compiled[a], compiled[names[j]], battle_type, distance,
+                                       target_width, seed=seed)
+            rates[i][j] = round(result["win_rate"], 4)
+            rates[j][i] = round(1 - result["win_rate"], 4)
+    return {"battle_type": battle_type, "distance": distance, "names": names, "rates": rates}
+
+
+def save_win_rate_matrix(matrix, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(matrix, f, indent=4)
+
+
+def load_win_rate_matrix(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class Matchmaker:
+    # Everything a query needs is built here once: normalized stat vectors for
+    # the roster, win-rate rows by name, and each known Zoid's opponents
+    # already sorted by closeness to an even fight.
+    def __init__(self, zoids, battle_type, matrix=None):
+        self.battle_type = battle_type
+        roster = sorted(filter_zoids(zoids, battle_type), key=lambda z: z["Name"])
+        self.names = [z["Name"] for z in roster]
+        raw = [stat_vector(z) for z in roster]
+        self.mins = [min(col) for col in zip(*raw)] if raw else []
+        self.spans = [(max(col) - lo) or 1.0 for col, lo in zip(zip(*raw), self.mins)]
+        self.vectors = [self.normalize(v) for v in raw]
+        self.raw_vectors = dict(zip(self.names, raw))
+
+        self.rows = {}
+        if matrix is not None:
+            if matrix["battle_type"] != battle_type:
+                raise ValueError(f"Win-rate matrix is for {matrix['battle_type']} battles, not {battle_type}")
+            index = {name: i for i, name in enumerate(matrix["names"])}
+            for name in self.names:
+                if name in index:
+                    row = matrix["rates"][index[name]]
+                    self.rows[name] = {opp: row[index[opp]] for opp in self.names if opp in index and opp != name}
+        self.ranked = {name: self._rank(row) for name, row in self.rows.items()}
+
+    def normalize(self, vector):
+        return [(x - lo) / span for x, lo, span in zip(vector, self.mins, self.spans)]
+
+    def nearest(self, zoid_data, k=3, exclude=None):
+        target = self.normalize(stat_vector(zoid_data))
+        candidates = (
+            (math.dist(target, vec), name)
+            for name, vec in zip(self.names, self.vectors)
+            if name != exclude
+        )
+        return heapq.nsmallest(k, candidates)
+
+    def expected_win_rates(self, zoid_data, neighbours=3):
+        # Known Zoids read straight from the matrix. Anything else (a new Zoid
+        # or an upgraded copy of a known one) gets an inverse-distance blend of
+        # its nearest known neighbours' rows.
+        name = zoid_data["Name"]
+        if name in self.rows and self.raw_vectors.get(name) == stat_vector(zoid_data):
+            return self.rows[name]
+        if not self.rows:
+            return None
+        known = [(d, n) for d, n in self.nearest(zoid_data, len(self.names)) if n in self.rows][:neighbours]
+        if known and known[0][0] == 0:
+            known = known[:1]
+        # A row has no entry for the neighbour itself; count that mirror match
+        # as even, and divide each opponent by the weight that actually
+        # covered it so no opponent is pulled towards zero.
+        sums = {}
+        totals = {}
+        for d, n in known:
+            w = 1 / d if d else 1.0
+            for opp, rate in list(self.rows[n].items()) + [(n, 0.5)]:
+                sums[opp] = sums.get(opp, 0.0) + rate * w
+                totals[opp] = totals.get(opp, 0.0) + w
+        sums.pop(name, None)
+        return {opp: total / totals[opp] for opp, total in sums.items()}
+
+    def _rank(self, rates):
+        return sorted(rates, key=lambda opp: (abs(rates[opp] - 0.5), opp))
+
+    def find_opponents(self, zoid_data, k=5):
+        # Returns up to k (opponent name, expected win rate) pairs, most even
+        # first. Without a matrix the rate is None and opponents are ranked by
+        # how close their stats are.
+        name = zoid_data["Name"]
+        if name in self.ranked and self.raw_vectors.get(name) == stat_vector(zoid_data):
+            row = self.rows[name]
+            return [(opp, row[opp]) for opp in self.ranked[name][:k]]
+        rates = self.expected_win_rates(zoid_data)
+        if rates is None:
+            return [(opp, None) for _, opp in self.nearest(zoid_data, k, exclude=name)]
+        return [(opp, rates[opp]) for opp in self._rank(rates)[:k]]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Balanced Zoid matchmaking")
+    parser.add_argument("--stats", default="ConvertedZoidStats.json")
+    parser.add_argument("--battle-type", choices=["land", "water", "air"], default="land")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="simulate the roster and save a win-rate matrix")
+    build.add_argument("output")
+    build.add_argument("--distance", type=float, default=500)
+    build.add_argument("--width", type=float, default=0.1)
+    match = sub.add_parser("match", help="list the most even opponents for a Zoid")
+    match.add_argument("zoid")
+    match.add_argument("--matrix")
+    match.add_argument("-k", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    zoids = load_zoids(args.stats)
+    if args.command == "build":
+        matrix = build_win_rate_matrix(zoids, args.battle_type, args.distance, args.width)
+        save_win_rate_matrix(matrix, args.output)
+        print(f"Saved {len(matrix['names'])}x{len(matrix['names'])} win-rate matrix to {args.output}")
+        return
+
+    zoid = next((z for z in zoids if z["Name"] == args.zoid), None)
+    if zoid is None:
+        print(f"Unknown Zoid: {args.zoid}")
+        return
+    matrix = load_win_rate_matrix(args.matrix) if args.matrix else None
+    matchmaker = Matchmaker(zoids, args.battle_type, matrix)
+    print(f"\nMost even opponents for {zoid['Name']}:")
+    for opp, rate in matchmaker.find_opponents(zoid, args.k):
+        print(f"  {opp}" + (f" (expected win rate {rate:.2f})" if rate is not None else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,404 @@
+import argparse
+import copy
+import math
+import random
+
+from ZoidsGame import Zoid, load_zoids, filter_zoids, get_range, is_attack_in_shield_arc, max_circling_angle
+
+# Two-sided normal quantiles for the confidence levels we report at
+Z_SCORES = {0.80: 1.2816, 0.90: 1.6449, 0.95: 1.9600, 0.99: 2.5758}
+
+
+class SimZoid(Zoid):
+    # The converted stats store weapon strength as Rank, and Concealment has no
+    # Senses list, so fall back to those so simulated Zoids can actually fight.
+    def __init__(self, zoid_data):
+        super().__init__(zoid_data)
+        self.data = zoid_data
+        rank = lambda t: next((p.get('Damage', p.get('Rank')) for p in self.powers if p['Type'] == t), None)
+        if self.melee is None:
+            self.melee = rank('Melee')
+        if self.close_range is None:
+            self.close_range = rank('Close-Range')
+        if self.mid_range is None:
+            self.mid_range = rank('Mid-Range')
+        if self.long_range is None:
+            self.long_range = rank('Long-Range')
+        if self.stealth is None:
+            self.stealth = rank('Concealment')
+        self.close_combat = self.close_combat or 0
+        self.ranged_combat = self.ranged_combat or 0
+        self.preferred_distance = self._preferred_distance()
+
+    def _preferred_distance(self):
+        bands = [(self.melee, 0), (self.close_range, 250), (self.mid_range, 750), (self.long_range, 1500)]
+        best = max(bands, key=lambda b: b[0] or 0)
+        return best[1] if best[0] else 0
+
+    def fresh(self):
+        # Compiled stats are shared, battle state is per duel
+        z = copy.copy(self)
+        z.position = "neutral"
+        z.shield_on = False
+        z.shieldDisabled = False
+        z.stealth_on = False
+        z.dents = 0
+        z.angle = 0.0
+        z.status = "intact"
+        return z
+
+    def attack_damage(self, distance):
+        # Strongest weapon that reaches, using the same reach rules as can_attack
+        options = []
+        if self.melee and distance == 0:
+            options.append(self.melee)
+        if self.close_range and distance <= 500:
+            options.append(self.close_range)
+        if self.mid_range and distance <= 1000:
+            options.append(self.mid_range)
+        if self.long_range and distance > 1000:
+            options.append(self.long_range)
+        return max(options) if options else None
+
+
+class DiceStream:
+    # All randomness in a simulated duel comes from here, so two duels with the
+    # same seed see the same rolls (common random numbers), and an antithetic
+    # stream mirrors every roll (d20 -> 21 - d20, heads -> tails).
+    def __init__(self, seed, antithetic=False):
+        self.rng = random.Random(seed)
+        self.antithetic = antithetic
+
+    def d20(self):
+        roll = self.rng.randint(1, 20)
+        return 21 - roll if self.antithetic else roll
+
+    def coin(self):
+        flip = self.rng.random() < 0.5
+        return not flip if self.antithetic else flip
+
+
+class RecordingDice:
+    # Wraps a DiceStream and remembers what it rolled, for spectators
+    def __init__(self, dice):
+        self.dice = dice
+        self.rolls = []
+
+    def d20(self):
+        roll = self.dice.d20()
+        self.rolls.append(roll)
+        return roll
+
+    def coin(self):
+        flip = self.dice.coin()
+        self.rolls.append("heads" if flip else "tails")
+        return flip
+
+
+def compile_zoids(zoids):
+    return {z["Name"]: SimZoid(z) for z in zoids}
+
+
+def _search(searcher, target, dice):
+    target_dc = 5 + target.stealth if target.has_stealth() and target.stealth_on else 0
+    return dice.d20() + searcher.awareness >= target_dc
+
+
+def _move(zoid, enemy, distance, battle_type, detected, dice):
+    speed = zoid.get_speed(battle_type)
+    if not detected:
+        if dice.coin():
+            distance = max(0, distance - speed * 0.5)
+            zoid.position = 'close'
+        else:
+            distance += speed * 0.5
+            zoid.position = 'retreat'
+        return distance, True, _search(zoid, enemy, dice)
+    target = zoid.preferred_distance
+    if enemy.shield_on and enemy.has_shield() and is_attack_in_shield_arc(zoid, enemy):
+        # Work around the front of an active shield
+        zoid.angle = (zoid.angle + min(90, max_circling_angle(speed, distance))) % 360
+        zoid.position = 'circle'
+        return distance, True, detected
+    if get_range(distance) != get_range(target):
+        if distance > target:
+            distance = max(target, distance - speed)
+            zoid.position = 'close'
+        else:
+            distance += speed
+            zoid.position = 'retreat'
+        return distance, True, detected
+    zoid.position = 'stand still'
+    return distance, False, detected
+
+
+def _shield_and_stealth(zoid, enemy, distance):
+    if zoid.has_shield():
+        zoid.shield_on = zoid.attack_damage(distance) is None and enemy.attack_damage(distance) is not None
+    if zoid.has_stealth():
+        zoid.stealth_on = True
+
+
+def _attack(zoid, enemy, distance, detected, dice):
+    damage = zoid.attack_damage(distance)
+    if damage is None:
+        return
+    if enemy.stealth_on and not detected and not dice.coin():
+        # Attack goes into the target's last known location
+        return
+    if distance == 0:
+        attack_roll = dice.d20() + zoid.fighting + zoid.close_combat
+        defense_roll = 10 + enemy.parry
+    else:
+        attack_roll = dice.d20() + zoid.dexterity + zoid.ranged_combat
+        defense_roll = 10 + enemy.dodge
+    if attack_roll < defense_roll:
+        return
+    if enemy.has_shield() and enemy.shield_on and is_attack_in_shield_arc(zoid, enemy):
+        if dice.d20() + enemy.shield >= damage + 15:
+            enemy.shieldDisabled = True
+            enemy.shield_on = False
+        return
+    toughness_roll = dice.d20() + enemy.toughness - enemy.dents
+    damage_difference = damage + 15 - toughness_roll
+    if damage_difference <= 0:
+        return
+    enemy.dents += 1
+    if damage_difference <= 5:
+        return
+    elif damage_difference <= 10:
+        enemy.status = "dazed"
+    elif damage_difference <= 15:
+        enemy.status = "stunned"
+    else:
+        enemy.status = "defeated"
+
+
+def simulate_duel(z1, z2, battle_type, distance, dice, first=None, max_turns=200, on_turn=None):
+    # Non-interactive version of ZoidsGame.game_loop with a simple policy for
+    # both sides. Returns 1 or 2 for the winner, or 0 if the turn cap is hit.
+    # on_turn, if given, is called after every turn with the turn number,
+    # distance, both Zoids and the dice rolled during that turn.
+    if on_turn is not None:
+        dice = RecordingDice(dice)
+    zoid_objs = {1: z1.fresh(), 2: z2.fresh()}
+    if first is None:
+        first = 1 if dice.coin() else 2
+    order = (1, 2) if first == 1 else (2, 1)
+    for turn in range(max_turns):
+        player = order[turn % 2]
+        zoid = zoid_objs[player]
+        enemy = zoid_objs[3 - player]
+        prior_status = zoid.status
+
+        if zoid.status == "stunned":
+            _shield_and_stealth(zoid, enemy, distance)
+            zoid.status = "dazed"
+        else:
+            detected = True
+            if enemy.stealth_on:
+                detected = _search(zoid, enemy, dice)
+            did_move = False
+            can_attack_now = zoid.attack_damage(distance) is not None and detected
+            if zoid.status != "dazed" or not can_attack_now:
+                distance, did_move, detected = _move(zoid, enemy, distance, battle_type, detected, dice)
+            _shield_and_stealth(zoid, enemy, distance)
+            if not (zoid.shield_on and zoid.has_shield()) and not (zoid.status == "dazed" and did_move):
+                _attack(zoid, enemy, distance, detected, dice)
+            if prior_status == "dazed":
+                zoid.status = "intact"
+
+        if on_turn is not None:
+            on_turn(turn, distance, zoid_objs, dice.rolls)
+            dice.rolls = []
+        if enemy.status == "defeated":
+            return player
+    return 0
+
+
+def _duel_score(z1, z2, battle_type, distance, seed, antithetic, first=None, max_turns=200):
+    winner = simulate_duel(z1, z2, battle_type, distance, DiceStream(seed, antithetic), first, max_turns)
+    return 1.0 if winner == 1 else 0.0 if winner == 2 else 0.5
+
+
+def _trial_seed(seed, trial):
+    return seed * 1000003 + trial
+
+
+class RunningStats:
+    # Welford running mean/variance of per-trial observations
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, x):
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+
+    def variance(self):
+        return self.m2 / (self.n - 1) if self.n > 1 else math.inf
+
+
+def wilson_interval(p, n, z):
+    # Wilson score interval for a proportion p seen over n trials. Unlike the
+    # plain mean +- z * sd interval it stays honest near 0 and 1, where a run
+    # of identical outcomes would otherwise look like a zero-width interval.
+    if n <= 0:
+        return (0.0, 1.0)
+    z2 = z * z
+    denom = 1 + z2 / n
+    centre = (p + z2 / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z2 / (4 * n * n)) / denom
+    return (max(0.0, centre - half), min(1.0, centre + half))
+
+
+def _win_rate_interval(stats, duels_per_trial, z):
+    # Each duel scores 0, 0.5 or 1, so p(1 - p) bounds its variance and the
+    # duels can be treated as Bernoulli trials. If a trial's duels vary more
+    # than independent ones would (mirrored dice that don't cancel), shrink
+    # the sample size to match; never grow it.
+    p = stats.mean
+    n = stats.n * duels_per_trial
+    if stats.n > 1 and 0 < p < 1:
+        n /= max(1.0, stats.variance() * duels_per_trial / (p * (1 - p)))
+    return wilson_interval(p, n, z)
+
+
+def _difference_interval(stats, z):
+    # Paired win-rate differences lie in [-1, 1]. Adding one pseudo-trial at
+    # each end (as in Agresti and Min's paired-proportion interval) keeps a
+    # run of zero differences from reading as a zero-width interval.
+    if stats.n == 0:
+        return (-1.0, 1.0)
+    n = stats.n + 2
+    mean = stats.mean * stats.n / n
+    squares = stats.m2 + stats.n * stats.mean ** 2 + 2
+    half = z * math.sqrt((squares - n * mean ** 2) / (n - 1) / n)
+    return (max(-1.0, mean - half), min(1.0, mean + half))
+
+
+def _sequential(observe, interval, target_width, min_trials, max_trials, batch):
+    # interval(stats) -> (low, high); sampling stops once it is narrow enough
+    stats = RunningStats()
+    duels = 0
+    while stats.n < max_trials:
+        for _ in range(min(batch, max_trials - stats.n)):
+            value, cost = observe(stats.n)
+            stats.add(value)
+            duels += cost
+        low, high = interval(stats)
+        if stats.n >= min_trials and high - low <= target_width:
+            break
+    return stats, duels, interval(stats)
+
+
+def estimate_win_rate(z1, z2, battle_type, distance=500, target_width=0.1, confidence=0.95,
+                      min_trials=20, max_trials=2000, batch=10, antithetic=True, seed=0,
+                      first=None, max_turns=200):
+    # Sample duels until the confidence interval on z1's win rate (draws count
+    # as half a win) is no wider than target_width. With antithetic=True each
+    # observation is the average of a duel and its mirrored-dice twin.
+    def observe(trial):
+        s = _trial_seed(seed, trial)
+        score = _duel_score(z1, z2, battle_type, distance, s, False, first, max_turns)
+        if not antithetic:
+            return score, 1
+        mirrored = _duel_score(z1, z2, battle_type, distance, s, True, first, max_turns)
+        return (score + mirrored) / 2, 2
+
+    z = Z_SCORES[confidence]
+    duels_per_trial = 2 if antithetic else 1
+    stats, duels, ci = _sequential(observe, lambda stats: _win_rate_interval(stats, duels_per_trial, z),
+                                   target_width, min_trials, max_trials, batch)
+    return {
+        "win_rate": stats.mean,
+        "ci": ci,
+        "trials": stats.n,
+        "duels": duels,
+    }
+
+
+def compare_variants(base, variant, opponent, battle_type, distance=500, target_width=0.1,
+                     confidence=0.95, min_trials=20, max_trials=2000, batch=10, antithetic=True,
+                     seed=0, first=None, max_turns=200):
+    # Estimate how much variant's win rate against opponent differs from
+    # base's. Both sides of every observation share a seed, so the dice noise
+    # mostly cancels out of the difference.
+    def observe(trial):
+        s = _trial_seed(seed, trial)
+        diff = (_duel_score(variant, opponent, battle_type, distance, s, False, first, max_turns)
+                - _duel_score(base, opponent, battle_type, distance, s, False, first, max_turns))
+        if not antithetic:
+            return diff, 2
+        diff += (_duel_score(variant, opponent, battle_type, distance, s, True, first, max_turns)
+                 - _duel_score(base, opponent, battle_type, distance, s, True, first, max_turns))
+        return diff / 2, 4
+
+    z = Z_SCORES[confidence]
+    stats, duels, ci = _sequential(observe, lambda stats: _difference_interval(stats, z), target_width,
+                                   min_trials, max_trials, batch)
+    return {
+        "difference": stats.mean,
+        "ci": ci,
+        "trials": stats.n,
+        "duels": duels,
+    }
+
+
+def matchup_report(zoids, battle_type, distance=500, target_width=0.1, confidence=0.95,
+                   min_trials=20, max_trials=2000, antithetic=True, seed=0):
+    compiled = compile_zoids(filter_zoids(zoids, battle_type))
+    names = sorted(compiled)
+    results = {}
+    total_duels = 0
+    for i, a in enumerate(names):
+        for b in names[i + 1:]:
+            result = estimate_win_rate(compiled[a], compiled[b], battle_type, distance, target_width,
+                                       confidence, min_trials, max_trials, antithetic=antithetic, seed=seed)
+            results[(a, b)] = result
+            total_duels += result["duels"]
+    return results, total_duels
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monte Carlo Zoid duel estimates")
+    parser.add_argument("zoid1", nargs="?", help="first Zoid (omit for a full matchup report)")
+    parser.add_argument("zoid2", nargs="?")
+    parser.add_argument("--stats", default="ConvertedZoidStats.json")
+    parser.add_argument("--battle-type", choices=["land", "water", "air"], default="land")
+    parser.add_argument("--distance", type=float, default=500)
+    parser.add_argument("--width", type=float, default=0.1, help="target confidence interval width")
+    parser.add_argument("--confidence", type=float, choices=sorted(Z_SCORES), default=0.95)
+    parser.add_argument("--max-trials", type=int, default=2000)
+    parser.add_argument("--no-antithetic", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    zoids = load_zoids(args.stats)
+    antithetic = not args.no_antithetic
+    if args.zoid1 and args.zoid2:
+        compiled = compile_zoids(zoids)
+        for name in (args.zoid1, args.zoid2):
+            if name not in compiled:
+                parser.error(f"Unknown Zoid: {name}")
+        result = estimate_win_rate(compiled[args.zoid1], compiled[args.zoid2], args.battle_type, args.distance,
+                                   args.width, args.confidence, max_trials=args.max_trials,
+                                   antithetic=antithetic, seed=args.seed)
+        lo, hi = result["ci"]
+        print(f"{args.zoid1} vs {args.zoid2}: {result['win_rate']:.3f} [{lo:.3f}, {hi:.3f}] "
+              f"after {result['duels']} duels")
+        return
+
+    results, total_duels = matchup_report(zoids, args.battle_type, args.distance, args.width, args.confidence,
+                                          max_trials=args.max_trials, antithetic=antithetic, seed=args.seed)
+    for (a, b), result in sorted(results.items()):
+        lo, hi = result["ci"]
+        print(f"{a} vs {b}: {result['win_rate']:.3f} [{lo:.3f}, {hi:.3f}] ({result['duels']} duels)")
+    print(f"\n{len(results)} matchups, {total_duels} duels simulated")
+
+
+if __name__ == "__main__":
+    main()
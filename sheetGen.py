@@ -1,12 +1,14 @@
 import json
 import os
 
+def safe_name(name):
+    return name.replace(" ", "_").replace("/", "_").lower()
+
 def format_zoid(zoid):
-    safe_name = zoid["Name"].replace(" ", "_").replace("/", "_").lower()
     lines = [f"====== {zoid['Name']} ======"]
     
     # Add lore link at the top
-    lines.append(f"[[{safe_name}|Lore]] | **RPG Stats**")
+    lines.append(f"[[{safe_name(zoid['Name'])}|Lore]] | **RPG Stats**")
     lines.append("")
 
     # Stats Table
@@ -100,8 +102,7 @@ def generate_zoid_index(input_json_path, output_dir):
         lines.append("^ Name ^ Cost (Credits) ^ Movement Type ^ Primary Weapons ^")
         
         for zoid in zoids_at_level:
-            safe_name = zoid["Name"].replace(" ", "_").replace("/", "_").lower()
-            zoid_link = f"[[{safe_name}_rp|{zoid['Name']}]]"
+            zoid_link = f"[[{safe_name(zoid['Name'])}_rp|{zoid['Name']}]]"
             
             # Get cost
             cost = f"{zoid.get('Cost', 0):,.0f}"
@@ -151,13 +152,12 @@ def generate_zoid_texts(input_json_path, output_dir):
     os.makedirs(output_dir, exist_ok=True)
 
     for zoid in zoids:
-        safe_name = zoid["Name"].replace(" ", "_").replace("/", "_").lower()
-        file_path = os.path.join(output_dir, f"{safe_name}_rp.txt")
+        file_path = os.path.join(output_dir, f"{safe_name(zoid['Name'])}_rp.txt")
         with open(file_path, "w", encoding="utf-8") as outfile:
             outfile.write(format_zoid(zoid))
 
     print(f"Exported {len(zoids)} Zoid files in DokuWiki format to: {output_dir}")
 
-# Example usage:
-generate_zoid_texts("ConvertedZoidStats.json", "ZoidTextFiles")
-generate_zoid_index("ConvertedZoidStats.json", "ZoidTextFiles")
+if __name__ == "__main__":
+    generate_zoid_texts("ConvertedZoidStats.json", "ZoidTextFiles")
+    generate_zoid_index("ConvertedZoidStats.json", "ZoidTextFiles")
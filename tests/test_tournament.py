@@ -0,0 +1,60 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import Tournament
+from ZoidsGame import load_zoids
+
+
+class ResumeTest(unittest.TestCase):
+    # A run interrupted part way through a round and resumed from its
+    # checkpoint must play out exactly like an uninterrupted one.
+
+    @classmethod
+    def setUpClass(cls):
+        cls.zoids = load_zoids(os.path.join(ROOT, "ConvertedZoidStats.json"))
+
+    def run_format(self, fmt, battle_type, checkpoint=None):
+        _, results = Tournament.run_tournament(self.zoids, fmt, battle_type, duels=1, workers=1,
+                                               checkpoint=checkpoint)
+        return results
+
+    def interrupt_and_resume(self, fmt, battle_type, stop_round):
+        full = self.run_format(fmt, battle_type)
+        self.assertGreater(max(res["round"] for res in full.values()), stop_round)
+        # Everything before stop_round, plus half of stop_round's matches
+        partial = {match_id: res for match_id, res in full.items() if res["round"] < stop_round}
+        current = sorted(match_id for match_id, res in full.items() if res["round"] == stop_round)
+        for match_id in current[:len(current) // 2]:
+            partial[match_id] = full[match_id]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "checkpoint.json")
+            Tournament.save_checkpoint(path, fmt, self.seeded(battle_type), partial)
+            resumed = self.run_format(fmt, battle_type, path)
+            self.assertEqual(resumed, full)
+
+            # Resuming a finished run plays nothing more
+            again = self.run_format(fmt, battle_type, path)
+            self.assertEqual(again, full)
+            with open(path, "r", encoding="utf-8") as f:
+                self.assertEqual(json.load(f)["results"], full)
+
+    def seeded(self, battle_type):
+        roster = {z["Name"]: z for z in Tournament.filter_zoids(self.zoids, battle_type)}
+        return sorted(roster, key=lambda name: (-roster[name].get("Power Level", 0), name))
+
+    def test_swiss_resume_mid_round(self):
+        self.interrupt_and_resume("swiss", "air", 2)
+
+    def test_double_elimination_resume_mid_round(self):
+        self.interrupt_and_resume("double-elimination", "air", 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import argparse
+import sys
+
+# Each subcommand imports its module only when it runs, so quick commands
+# don't pay for the simulator (or anything else) on startup.
+
+
+def convert(args):
+    import MMConverter
+    MMConverter.main(args.input, args.output)
+
+
+def sheets(args):
+    import sheetGen
+    sheetGen.generate_zoid_texts(args.stats, args.output_dir)
+
+
+def index(args):
+    import sheetGen
+    sheetGen.generate_zoid_index(args.stats, args.output_dir)
+
+
+def sync(argv):
+    import SheetParser
+    SheetParser.main(argv)
+
+
+def query(argv):
+    import RosterQuery
+    RosterQuery.main(argv)
+
+
+def play(args):
+    import ZoidsGame
+    ZoidsGame.main()
+
+
+def simulate(argv):
+    import ZoidsSim
+    ZoidsSim.main(argv)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="zoids", description="Zoids RPG tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("convert", help="convert raw ZoidStats.json into RPG stats")
+    p.add_argument("input", nargs="?", default="ZoidStats.json")
+    p.add_argument("output", nargs="?", default="ConvertedZoidStats.json")
+    p.set_defaults(func=convert)
+
+    p = sub.add_parser("sheets", help="write a DokuWiki stat sheet per Zoid")
+    p.add_argument("stats", nargs="?", default="ConvertedZoidStats.json")
+    p.add_argument("output_dir", nargs="?", default="ZoidTextFiles")
+    p.set_defaults(func=sheets)
+
+    p = sub.add_parser("index", help="write the DokuWiki index page")
+    p.add_argument("stats", nargs="?", default="ConvertedZoidStats.json")
+    p.add_argument("output_dir", nargs="?", default="ZoidTextFiles")
+    p.set_defaults(func=index)
+
+    # Listed for --help only; main() hands their arguments straight to the
+    # module's own parser
+    sub.add_parser("sync", help="diff edited wiki sheets against the roster")
+    sub.add_parser("query", help="search the roster")
+    sub.add_parser("simulate", help="Monte Carlo duel estimates")
+
+    p = sub.add_parser("play", help="play a duel in the console")
+    p.set_defaults(func=play)
+    return parser
+
+
+# Commands whose arguments (options and --help included) belong to another
+# module's parser
+PASSTHROUGH = {"sync": sync, "query": query, "simulate": simulate}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in PASSTHROUGH:
+        PASSTHROUGH[argv[0]](argv[1:])
+        return
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])